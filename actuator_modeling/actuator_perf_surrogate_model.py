@@ -5,8 +5,7 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import random
-from scipy.optimize import curve_fit
+from numba import njit
 
 
 # step 1: load data from csv file (originally on Teams)
@@ -19,28 +18,25 @@ raw_data = raw_data.dropna()
 # step 2: construct pareto front of existing data
 #         i. e. loop over the data. For each point, check if it it dominated by another point by looping over all other data
 #         If there exists another point that has a higher torque, higher speed, and lower mass, remove the first point
+#         The pairwise check is done all at once: entry [i, j] of the dominance matrix is True if point j dominates point i
 
-pareto_front = raw_data.copy()
+candidate_torques = raw_data['Rated Torque'].to_numpy()
+candidate_speeds = raw_data['Rated Speed'].to_numpy()
+candidate_masses = raw_data['total weight'].to_numpy()
 
-for i, actuator_candidate in raw_data.iterrows():
-    for j, actuator_comparison in raw_data.iterrows():
-        if i != j:
-            # check if actuator_candidate is dominated by actuator_comparison
-            if (actuator_candidate['Rated Torque'] < actuator_comparison['Rated Torque'] and
-                actuator_candidate['Rated Speed'] < actuator_comparison['Rated Speed'] and
-                actuator_candidate['total weight'] > actuator_comparison['total weight']):
+dominated = ((candidate_torques[None, :] > candidate_torques[:, None]) &
+             (candidate_speeds[None, :] > candidate_speeds[:, None]) &
+             (candidate_masses[None, :] < candidate_masses[:, None])).any(axis=1)
 
-                # remove actuator_candidate from the list of candidates
-                pareto_front = pareto_front.drop(i)
-                break
+pareto_front = raw_data.loc[~dominated]
 
 
 #plot pareto front data
 
 skus = pareto_front['SKU'].to_list()
-torques = pareto_front['Rated Torque'].to_list()
-speeds = pareto_front['Rated Speed'].to_list()
-masses = pareto_front['total weight'].to_list()
+torques = pareto_front['Rated Torque'].to_numpy(dtype=float)
+speeds = pareto_front['Rated Speed'].to_numpy(dtype=float)
+masses = pareto_front['total weight'].to_numpy(dtype=float)
 
 
 fig = plt.figure(figsize=(8, 7))
@@ -57,98 +53,115 @@ sample_size = int(len(skus))
 
 validation_subset_size = int(sample_size * validation_subset_fraction)
 
-validation_torques = [[] for _ in range(validation_subsets)]
-validation_speeds = [[] for _ in range(validation_subsets)]
-validation_masses = [[] for _ in range(validation_subsets)]
+# each subset is a random ordering of the row indices: the first validation_subset_size rows are the validation subset,
+# the rest are the training subset. The data arrays are sliced with these indices, never copied into per-subset lists
+# Row s of validation_rows / training_rows holds the indices for subset s
+rng = np.random.default_rng(0)
+sampling_orders = rng.permuted(np.tile(np.arange(sample_size), (validation_subsets, 1)), axis=1)
+validation_rows = sampling_orders[:, :validation_subset_size]
+training_rows = sampling_orders[:, validation_subset_size:]
 
-training_torques = [[] for _ in range(validation_subsets)]
-training_speeds = [[] for _ in range(validation_subsets)]
-training_masses = [[] for _ in range(validation_subsets)]
 
-for i in range(validation_subsets):
-    sampling_order = [i for i in range(sample_size)]
-    random.shuffle(sampling_order)
 
-    # construct validation subset
-    for j in range(0, validation_subset_size):
-        
-        random_index = sampling_order[j]
-
-        validation_torques[i].append(torques[random_index])
-        validation_speeds[i].append(speeds[random_index])
-        validation_masses[i].append(masses[random_index])
-
-    # construct the training subset
-    for j in range(validation_subset_size, sample_size):
-        
-        random_index = sampling_order[j]
-
-        training_torques[i].append(torques[random_index])
-        training_speeds[i].append(speeds[random_index])
-        training_masses[i].append(masses[random_index])
 
 
 
+# step 3: fit an n-degree polynomial to the pareto front data
 
+@njit(cache=True, fastmath=True)
+def _poly_eval(torque, speed, weights, degree):
+    """
+    Compiled kernel behind n_degree_polynomial. torque and speed are 1-D float64 arrays of the same length.
+    Weight i*(degree+1) + j multiplies torque^i * speed^j.
+    """
+    out = np.empty(torque.shape[0])
+    for k in range(torque.shape[0]):
+        value = 0.0
+        torque_power = 1.0
+        for i in range(degree + 1):
+            speed_power = 1.0
+            for j in range(degree + 1):
+                value += weights[i * (degree + 1) + j] * torque_power * speed_power
+                speed_power *= speed[k]
+            torque_power *= torque[k]
+        out[k] = value
+    return out
 
 
-# step 3: fit an n-degree polynomial to the pareto front data
-
 def n_degree_polynomial(X, *weights):
     """
-    Polynomial function of variable degree for curve fitting.
+    Polynomial function of variable degree.
+    Accepts scalar or array torque/speed and returns a result of the same shape.
     """
     torque, speed = X
     degree = int((len(weights) ** 0.5) - 1)  # Infer degree from the number of weights
 
-    function_value = 0.0
-    weight_index = 0
-    for i in range(degree + 1):
-        for j in range(degree + 1):
-            function_value += weights[weight_index] * (torque ** i) * (speed ** j)
-            weight_index += 1
+    torque = np.asarray(torque, dtype=np.float64)
+    speed = np.asarray(speed, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
 
-    return function_value
+    function_value = _poly_eval(torque.ravel(), speed.ravel(), weights, degree).reshape(torque.shape)
+    return function_value[()]  # unwraps a 0-d result back to a scalar for scalar inputs
 
 
+# compile the kernel up front so the first evaluation is not charged for it
+_poly_eval(np.zeros(1), np.zeros(1), np.zeros(4), 1)
 
-# Perform cross validation to determine best polynomial degree
 
-max_polynomial_degree = 5  # Maximum degree of polynomial to fit
+def polynomial_design_matrix(torque_powers, speed_powers, degree):
+    """
+    Design matrix of the n-degree polynomial: column i*(degree+1) + j holds torque^i * speed^j,
+    matching the weight order of n_degree_polynomial. The polynomial is linear in its weights,
+    so fitting it is an ordinary least squares problem on this matrix.
+    torque_powers and speed_powers are increasing Vandermonde tables ([k, i] = value_k^i) of at least degree + 1 columns,
+    so tables built once for the highest degree serve every lower degree.
+    """
+    design_matrix = np.einsum('ki,kj->kij', torque_powers[:, :degree + 1], speed_powers[:, :degree + 1])
+    return design_matrix.reshape(len(torque_powers), (degree + 1) ** 2)
 
-cross_valid_SSEs = [[] for _ in range(1, max_polynomial_degree)]
-average_SSEs = []
 
-for degree in range(1, max_polynomial_degree):
 
-    for subset_index in range(validation_subsets):
+def lstsq_rcond(design_matrix):
+    """
+    Singular-value cutoff for every least squares fit of the polynomial, NumPy's rcond=None default for the full
+    design matrix. Passed explicitly so the cross-validation fits and the final fit use the same cutoff: the
+    high-degree design matrices are ill-conditioned enough that the cutoff changes the solution.
+    """
+    return np.finfo(np.float64).eps * max(design_matrix.shape)
 
-        # Dynamically calculate the number of weights based on the degree
-        num_weights = (degree + 1) ** 2
-        initial_weights = [0.1] * num_weights  # Initial guess for weights
 
-        # Fit the curve only using the training subset
+def _validation_SSEs(design_matrix, masses, training_rows, validation_rows, rcond):
+    """
+    Fits the polynomial to each training subset and returns the SSE on the matching validation subset.
+    Row s of training_rows / validation_rows holds the row indices of subset s.
+    rcond is the lstsq singular-value cutoff, see lstsq_rcond.
+    """
+    SSEs = np.empty(len(training_rows))
+    for subset_index, (training, validation) in enumerate(zip(training_rows, validation_rows)):
+        fitted_weights, *_ = np.linalg.lstsq(design_matrix[training], masses[training], rcond=rcond)
+        residuals = masses[validation] - design_matrix[validation] @ fitted_weights
+        SSEs[subset_index] = np.sum(residuals ** 2)
+    return SSEs
 
-        fit = curve_fit(
-            n_degree_polynomial,
-            (training_torques[subset_index], training_speeds[subset_index]),
-            training_masses[subset_index],
-            p0=initial_weights,
-            maxfev=10000
-        )
 
-        fitted_weights = fit[0]
+# Perform cross validation to determine best polynomial degree
 
+max_polynomial_degree = 5  # Maximum degree of polynomial to fit
 
-        # find the SSE with respect to the corresponding validation subset
-        subset_SSE = 0.0
+# powers of the data used by every degree below, computed once
+torque_powers = np.vander(torques, max_polynomial_degree + 1, increasing=True)
+speed_powers = np.vander(speeds, max_polynomial_degree + 1, increasing=True)
 
-        for k in range(len(validation_torques[subset_index])):
-            test_point = (validation_torques[subset_index][k], validation_speeds[subset_index][k])
-            fit_value = n_degree_polynomial(test_point, *fitted_weights)
-            subset_SSE += (validation_masses[subset_index][k] - fit_value) ** 2
-        
-        cross_valid_SSEs[degree - 1].append(subset_SSE)
+cross_valid_SSEs = []
+average_SSEs = []
+
+for degree in range(1, max_polynomial_degree):
+
+    design_matrix = polynomial_design_matrix(torque_powers, speed_powers, degree)
+
+    # Fit the polynomial to each training subset and find the SSE with respect to the corresponding validation subset
+    cross_valid_SSEs.append(_validation_SSEs(design_matrix, masses, training_rows, validation_rows,
+                                             lstsq_rcond(design_matrix)))
     
     average_SSE_for_current_degree = np.mean((cross_valid_SSEs[degree - 1]))
     average_SSEs.append(average_SSE_for_current_degree)
@@ -167,19 +180,10 @@ plt.title("Cross-validation SSE for Different Polynomial Degrees")
 
 # build a model using all of the data and a specified degree
 degree = 2          #should be manually set based on the results of the above cross-validation
-num_weights = (degree + 1) ** 2
-initial_weights = [0.1] * num_weights  # Initial guess for weights
-
-# Fit the curve
-fit = curve_fit(
-    n_degree_polynomial,
-    (torques, speeds),
-    masses,
-    p0=initial_weights,
-    maxfev=10000
-)
 
-fitted_weights = fit[0]
+# Fit the polynomial
+design_matrix = polynomial_design_matrix(torque_powers, speed_powers, degree)
+fitted_weights, *_ = np.linalg.lstsq(design_matrix, masses, rcond=lstsq_rcond(design_matrix))
 
 
 
@@ -196,18 +200,8 @@ x = np.linspace(0, 130, 30)
 y = np.linspace(0, 650, 30)
   
 X, Y = np.meshgrid(x, y)
-Z = np.zeros(X.shape)
-
-for i in range(X.shape[0]):
-    for j in range(X.shape[1]):
-        Z[i, j] = n_degree_polynomial((X[i, j], Y[i, j]), *fitted_weights)
-
-for i in range(len(Z)):
-    for j in range(len(Z[i])):
-        if Z[i][j] > 3:
-            Z[i][j] = 3
-        if Z[i][j] < 0:
-            Z[i][j] = 0
+Z = n_degree_polynomial((X, Y), *fitted_weights)
+np.clip(Z, 0, 3, out=Z)       # keep the surface within the plotted mass range
 
 ax.plot_wireframe(X, Y, Z, color ='green')
 ax.set_xlabel("Torque (Nm)")
@@ -1,19 +1,25 @@
+from pathlib import Path
+
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 
 torque = 10.354
 rpm = 1.184113
 
 max_ratio = 150
 
-motor_torques = [0 for i in range(max_ratio)]
-motor_rpms = [0 for i in range(max_ratio)]
-
-for i in range(1, max_ratio):
-    motor_torques[i] = torque / i
-    motor_rpms[i] = rpm * i
+# entry i is the output torque/speed through an i:1 gear ratio (entry 0 is left at zero)
+gear_ratios = np.arange(1, max_ratio, dtype=np.float64)
 
-plt.plot(motor_rpms, motor_torques, "o")
-plt.plot([0, 5310], [2.43, 0], '-o')
-plt.show()
+motor_torques = np.zeros(max_ratio)
+motor_rpms = np.zeros(max_ratio)
 
+motor_torques[1:] = torque / gear_ratios
+motor_rpms[1:] = rpm * gear_ratios
 
+if __name__ == "__main__":
+    matplotlib.use('Agg')  # non-interactive backend: the plot is saved to a file, no GUI window is opened
+    plt.plot(motor_rpms, motor_torques, "o")
+    plt.plot([0, 5310], [2.43, 0], '-o')
+    plt.savefig(Path(__file__).with_name("motor_calcs.png"))  # next to this script, whatever the working directory
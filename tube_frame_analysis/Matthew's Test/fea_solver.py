@@ -3,14 +3,15 @@
 FEA Solver for Frame Analysis using PyNite
 ===========================================
 
-This module uses the PyNiteFEA library to perform 3D finite element analysis
-on a planar truss frame. It simulates the structural response of a triangular
-frame under a vertical load applied at the top node. All members are modeled
-as pin-connected truss elements (no bending moment resistance).
-
-Key Steps:
-----------
-- Define a 3D FE model (FEModel3D) per frame.
+This module evaluates a planar truss frame in closed form, or with the
+PyNiteFEA library as an equivalent 3D finite element analysis. It simulates
+the structural response of a triangular frame under a vertical load applied
+at the top node. All members are modeled as pin-connected truss elements
+(no bending moment resistance).
+
+Key Steps (PyNite path, use_exact=True):
+----------------------------------------
+- Build one 3D FE model (FEModel3D) per process, updated in place for each frame.
 - Add nodes and members based on geometry.
 - Assign material and section properties.
 - Apply support constraints (fixed and roller supports).
@@ -28,9 +29,9 @@ Constraints:
 This module is called by the genetic optimizer to evaluate candidate frames.
 """
 from Pynite import FEModel3D # type: ignore
-from Pynite.FEModel3D import FEModel3D # type: ignore
 import math
-from frame import E, G, nu, density, yield_stress
+import numpy as np
+from numba import njit
 
 # Use the same material properties defined in frame.py
 from frame import E, G, nu, density, yield_stress
@@ -38,25 +39,114 @@ from frame import E, G, nu, density, yield_stress
 # Define allowable deflection (e.g., maximum vertical deflection at top node)
 max_deflection = 0.1  # meters (example limit)
 
-def analyze_frame(frame):
-    """Run FEA on the given frame using PyNite and return mass, max_stress, max_deflection."""
+# External load: downward force at the top node
+load_value = 100000.0  # N (~10 tons)
+
+# PyNite's default load combination, which holds the results of model.analyze()
+COMBO = 'Combo 1'
+
+# PyNite model keys, shared by the model build, the per-frame update, and result extraction
+MATERIAL = 'Steel'
+LEFT_SEC, RIGHT_SEC, BASE_SEC = 'LeftSec', 'RightSec', 'BaseSec'
+N_LEFT, N_RIGHT, N_TOP = 'N_left', 'N_right', 'N_top'  # match the node names in Frame.nodes
+
+def analyze_frame(frame, use_exact=False):
+    """Return mass, max_stress, max_deflection of the given frame.
+
+    The frame is a statically determinate pin-jointed triangle, so by default the
+    member forces come straight from equilibrium at the top node and the top
+    deflection from the unit-load method. use_exact=True runs the full PyNite
+    model instead, for validating the closed form.
+    """
+    if use_exact:
+        return _analyze_frame_pynite(frame)
+
+    designs = np.array([[frame.width, frame.height, frame.area_left, frame.area_right, frame.area_base]])
+    mass, max_stress, top_deflection = analyze_designs(designs)
+
+    return float(mass[0]), float(max_stress[0]), float(top_deflection[0])
+
+def analyze_designs(designs):
+    """Closed-form mass, max_stress, max_deflection for a whole population at once.
+
+    designs is an (N, 5) array with one row of [width, height, area_left,
+    area_right, area_base] per frame; each result is an (N,) array.
+    """
+    return _solve_designs(np.ascontiguousarray(designs, dtype=np.float64), E, load_value, density)
+
+@njit(cache=True, fastmath=True)
+def _solve_designs(designs, E, load_value, density):
+    """Compiled kernel behind analyze_designs.
+
+    E, load_value and density are passed in rather than read as globals: numba would
+    freeze globals into the cached machine code, which is not invalidated when frame.py changes.
+    """
+    n = designs.shape[0]
+    mass = np.empty(n)
+    max_stress = np.empty(n)
+    top_deflection = np.empty(n)
+
+    for k in range(n):
+        width = designs[k, 0]
+        height = designs[k, 1]
+        area_left = designs[k, 2]
+        area_right = designs[k, 3]
+        area_base = designs[k, 4]
+
+        # Leg geometry: both legs run from a base node to the top node at angle theta
+        leg_len = math.sqrt(0.25*width*width + height*height)
+        sin_t = height / leg_len
+        cos_t = 0.5*width / leg_len
+
+        # Equilibrium at the top node: the legs share the vertical load, the base tie
+        # carries the horizontal component of the leg force
+        leg_axial = load_value / (2.0 * sin_t)
+        base_axial = leg_axial * cos_t
+
+        # Axial stresses = force / area
+        stress_left = leg_axial / area_left
+        stress_right = leg_axial / area_right
+        stress_base = base_axial / area_base
+        max_stress[k] = max(stress_left, stress_right, stress_base)
+
+        # Unit-load method: delta = sum(N * n * L / (E * A)) with n = N / load_value
+        top_deflection[k] = (leg_axial*leg_axial * leg_len * (1.0/area_left + 1.0/area_right)
+                             + base_axial*base_axial * width / area_base) / (E * load_value)
+
+        # Mass = density * (area * length) for each member, as in Frame.calc_mass
+        mass[k] = ((area_left + area_right) * leg_len + area_base * width) * density
+
+    return mass, max_stress, top_deflection
+
+# compile the kernel up front so the first generation is not charged for it
+_solve_designs(np.ones((1, 5)), E, load_value, density)
+
+def _square_section(area):
+    """Square cross-section approximation for a member of the given area: returns A, Iy, Iz, J."""
+    # Side length is sqrt(area), so I = side^4 / 12 reduces to area^2 / 12
+    I = area * area / 12.0          # Moment of inertia (square cross-section)
+    J = 2 * I                       # Approximate torsional constant
+    return area, I, I, J
+
+def _section_areas(frame):
+    """Cross-sectional area of each PyNite section, keyed by the section names used in Frame.members."""
+    return {LEFT_SEC: frame.area_left, RIGHT_SEC: frame.area_right, BASE_SEC: frame.area_base}
+
+def _member_name(start_node, end_node):
+    """PyNite member name of the Frame.members entry connecting start_node to end_node."""
+    return f"M_{start_node}_{end_node}"
+
+def _build_pynite_model(frame):
+    """Assemble the PyNite model of the frame: material, sections, nodes, supports, members, and load."""
     # Create a new 3D finite element model instance
     model = FEModel3D()
 
     # Add steel material (Young's modulus, shear modulus, Poisson's ratio, density)
-    model.add_material('Steel', E, G, nu, density)
-
-    # Define helper to add square cross-section approximations based on area
-    def add_section(name, area):
-        side = (area ** 0.5)            # Square section side length
-        I = (side ** 4) / 12.0          # Moment of inertia (square cross-section)
-        J = 2 * I                       # Approximate torsional constant
-        model.add_section(name, area, I, I, J)
+    model.add_material(MATERIAL, E, G, nu, density)
 
     # Assign sections to members
-    add_section('LeftSec', frame.area_left)
-    add_section('RightSec', frame.area_right)
-    add_section('BaseSec', frame.area_base)
+    for section_name, area in _section_areas(frame).items():
+        model.add_section(section_name, *_square_section(area))
 
     # Add nodes to the model
     for node_name, coord in frame.nodes.items():
@@ -65,46 +155,61 @@ def analyze_frame(frame):
 
     # Support conditions:
     # Left support: fixed X, Y, Z translations; free rotation about Z (in-plane), fix rotations about X,Y (out-of-plane)
-    model.def_support('N_left', True, True, True, True, True, True)
+    model.def_support(N_LEFT, True, True, True, True, True, True)
     # Right support: fixed Y, Z translations; free X translation (roller); fix out-of-plane rotations; free in-plane rot
-    model.def_support('N_right', False, True, True, True, True, True)
+    model.def_support(N_RIGHT, False, True, True, True, True, True)
     # Top node is free (but out-of-plane motions are inherently constrained by supports and member connectivity)
 
-    model.def_support('N_top', False, False, False, False, False, True)
-    # Add truss-like members (pin-jointed via moment releases)
-    model.add_member('M_left',  'N_left',  'N_top', 'Steel', 'LeftSec')
-    model.add_member('M_right', 'N_right', 'N_top', 'Steel', 'RightSec')
-    model.add_member('M_base',  'N_left',  'N_right', 'Steel', 'BaseSec')
-
-    # Simulate truss behavior: release moments at both ends of each member
-    for m in ['M_left', 'M_right', 'M_base']:
-        model.def_releases(m, Rzi=True, Rzj=True)
+    model.def_support(N_TOP, False, False, False, False, False, True)
+    # Add truss-like members from the frame's connectivity
+    for start_node, end_node, section_name in frame.members:
+        member_name = _member_name(start_node, end_node)
+        model.add_member(member_name, start_node, end_node, MATERIAL, section_name)
+        # Simulate truss behavior: release moments at both ends of each member
+        model.def_releases(member_name, Rzi=True, Rzj=True)
 
     # Apply external load: downward force at the top node
-    load_value = 100000.0  # N (~10 tons)
-    model.add_node_load('N_top', 'FY', -load_value)
+    model.add_node_load(N_TOP, 'FY', -load_value)
+
+    return model
+
+def _update_pynite_model(model, frame):
+    """Move an existing model onto the given frame: only section properties and node coordinates change."""
+    for section_name, area in _section_areas(frame).items():
+        section = model.sections[section_name]
+        section.A, section.Iy, section.Iz, section.J = _square_section(area)
+
+    for node_name, coord in frame.nodes.items():
+        node = model.nodes[node_name]
+        node.X, node.Y, node.Z = coord
+
+# One model per process, built on the first exact analysis and updated in place for every frame after it
+_pynite_model = None
+
+def _analyze_frame_pynite(frame):
+    """Run FEA on the given frame using PyNite and return mass, max_stress, max_deflection."""
+    global _pynite_model
+    if _pynite_model is None:
+        _pynite_model = _build_pynite_model(frame)
+    else:
+        _update_pynite_model(_pynite_model, frame)
+    model = _pynite_model
 
     # Solve the model
     model.analyze()
 
-    # Extract support reactions for force recovery (static analysis)
-    Rxn_left_X = model.nodes['N_left'].RxnFX['Combo 1']
-    Rxn_left_Y = model.nodes['N_left'].RxnFY['Combo 1']
-    Rxn_right_Y = model.nodes['N_right'].RxnFY['Combo 1']
-
-    # Use equilibrium to compute axial forces in each member
-    base_axial = abs(Rxn_left_X)  # Base tie force
-    left_leg_axial = math.sqrt(Rxn_left_Y**2 + Rxn_left_X**2)
-    right_leg_axial = math.sqrt(Rxn_right_Y**2 + Rxn_left_X**2)
+    # Axial force in each member, read from PyNite's member results (tension or compression)
+    def member_axial(member_name):
+        member = model.members[member_name]
+        return max(abs(member.max_axial(COMBO)), abs(member.min_axial(COMBO)))
 
     # Axial stresses = force / area
-    stress_left = abs(left_leg_axial) / frame.area_left
-    stress_right = abs(right_leg_axial) / frame.area_right
-    stress_base = abs(base_axial) / frame.area_base
-    max_stress = max(stress_left, stress_right, stress_base)
+    section_areas = _section_areas(frame)
+    max_stress = max(member_axial(_member_name(start_node, end_node)) / section_areas[section_name]
+                     for start_node, end_node, section_name in frame.members)
 
     # Get vertical deflection of the top node
-    top_deflection = abs(model.nodes['N_top'].DY['Combo 1'])
+    top_deflection = abs(model.nodes[N_TOP].DY[COMBO])
 
     # Calculate frame mass
     mass = frame.calc_mass()
@@ -48,6 +48,13 @@ class Frame:
     MIN_AREA = 1e-4    # Minimum cross-sectional area (m^2)
     MAX_AREA = 1.0     # Maximum cross-sectional area (m^2)
 
+    # Define members as tuples of (start_node, end_node, section_name)
+    MEMBERS = (
+        ("N_left", "N_top", "LeftSec"),    # left leg
+        ("N_right", "N_top", "RightSec"),  # right leg
+        ("N_left", "N_right", "BaseSec")   # base tie
+    )
+
     def __init__(self, width, height, area_left, area_right, area_base):
         # Frame geometry (width and height define node positions)
         self.width = width
@@ -62,12 +69,8 @@ class Frame:
             "N_right": (self.width, 0.0, 0.0),
             "N_top": (self.width/2.0, self.height, 0.0)
         }
-        # Define members as tuples of (start_node, end_node, section_name)
-        self.members = [
-            ("N_left", "N_top", "LeftSec"),    # left leg
-            ("N_right", "N_top", "RightSec"),  # right leg
-            ("N_left", "N_right", "BaseSec")   # base tie
-        ]
+        # Members are the same for every frame, so all frames share one topology
+        self.members = Frame.MEMBERS
 
     @staticmethod
     def random_frame():
@@ -117,7 +120,7 @@ class Frame:
         This is the objective function for the optimization.
         """
         # Compute member lengths
-        left_len = math.sqrt((self.width/2.0)**2 + (self.height)**2)
+        left_len = math.hypot(self.width/2.0, self.height)
         right_len = left_len  # symmetry
         base_len = self.width
         # Mass = density * (area * length) for each member
@@ -14,9 +14,9 @@ Key Algorithm Steps:
 2. Evaluate each frame via FEA (mass, max stress, deflection).
 3. Assign fitness = mass + penalties (if constraints are violated).
 4. Rank frames by fitness (lower is better).
-5. Select top-performing frames as parents.
+5. Select parents by 3-way tournament.
 6. Apply crossover and mutation to generate offspring.
-7. Repeat for a fixed number of generations.
+7. Repeat for a fixed number of generations, or until the best fitness stops improving.
 
 Constraint Handling:
 --------------------
@@ -32,97 +32,230 @@ Advantages:
 
 Used with: frame.py (Frame geometry) and fea_solver.py (FEA analysis)
 """
-import random
-import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
 from matplotlib import pyplot as plt
 from frame import Frame
-from fea_solver import analyze_frame, yield_stress, max_deflection
+from fea_solver import analyze_frame, analyze_designs, yield_stress, max_deflection
 
-def optimize_frame(pop_size=20, generations=50):
-    """Genetic algorithm to minimize frame mass under stress/deflection constraints."""
+# Design-variable bounds in population column order: width, height, area_left, area_right, area_base
+LOWER_BOUNDS = np.array([Frame.MIN_WIDTH, Frame.MIN_HEIGHT, Frame.MIN_AREA, Frame.MIN_AREA, Frame.MIN_AREA])
+UPPER_BOUNDS = np.array([Frame.MAX_WIDTH, Frame.MAX_HEIGHT, Frame.MAX_AREA, Frame.MAX_AREA, Frame.MAX_AREA])
+
+# Exact analyses are skipped for frames whose closed-form stress exceeds this multiple of yield
+SCREEN_STRESS_FACTOR = 3.0
+
+# Shared generator for every random draw in the GA; each draw covers a whole generation at once
+RNG = np.random.default_rng()
+
+def _tournament(fitness, size, k=3):
+    """Indices of `size` k-tournament winners: each draws k random frames and keeps the fittest."""
+    contenders = RNG.integers(len(fitness), size=(size, k))
+    return contenders[np.arange(size), np.argmin(fitness[contenders], axis=1)]
+
+# Worker-side view of the shared population, attached once per worker process
+_shared_memory = None
+_shared_population = None
+
+def _attach_population(name, shape):
+    """Worker initializer: map the shared population array, so each task only needs a row index."""
+    global _shared_memory, _shared_population
+    _shared_memory = shared_memory.SharedMemory(name=name)
+    _shared_population = np.ndarray(shape, dtype=np.float64, buffer=_shared_memory.buf)
+
+def _analyze_exact(row):
+    """PyNite analysis of one row of the shared population; module-level so worker processes can unpickle it."""
+    return analyze_frame(Frame(*_shared_population[row]), use_exact=True)
+
+class ExactEvaluator:
+    """Worker processes that analyze GA frames with the full PyNite model.
+
+    The population is copied into shared memory once per generation and workers
+    read their rows from it, so tasks carry only row indices. PyNite results are
+    kept by design tuple for the life of the evaluator, so elites and repeated
+    children are only solved once.
+    """
+
+    def __init__(self, pop_size, processes=None):
+        # Frames are handed out in chunks (about 4 per worker per generation) so task dispatch is amortized
+        workers = processes or os.cpu_count() or 1
+        self.chunksize = max(1, pop_size // (4 * workers))
+        self.results = {}
+
+        self._memory = shared_memory.SharedMemory(create=True, size=pop_size * 5 * np.dtype(np.float64).itemsize)
+        self.population = np.ndarray((pop_size, 5), dtype=np.float64, buffer=self._memory.buf)
+        self.pool = ProcessPoolExecutor(workers, initializer=_attach_population,
+                                        initargs=(self._memory.name, (pop_size, 5)))
+
+    def analyze(self, population, rows):
+        """PyNite (mass, max_stress, max_deflection) for the given rows of the population, in order."""
+        designs = [tuple(population[row]) for row in rows]
+        misses = {}  # design tuple -> first row holding it
+        for row, design in zip(rows, designs):
+            if design not in self.results:
+                misses.setdefault(design, row)
+
+        if misses:
+            self.population[:] = population
+            self.results.update(zip(misses, self.pool.map(_analyze_exact, misses.values(), chunksize=self.chunksize)))
+        return [self.results[design] for design in designs]
+
+    def close(self):
+        self.pool.shutdown()
+        self.population = None  # release the view before closing the mapping
+        self._memory.close()
+        self._memory.unlink()
+
+def evaluate_population(population, exact=None, best_fitness=float('inf')):
+    """Mass, max_stress, max_deflection arrays for every row of the population.
+
+    With an ExactEvaluator, each frame is analyzed with the full PyNite model in
+    a worker process; otherwise the closed-form solver evaluates the whole
+    population at once. best_fitness is the best fitness found so far, used to
+    skip PyNite solves for frames that cannot beat it.
+    """
+    mass, max_stress, max_defl = analyze_designs(population)
+    if exact is None:
+        return mass, max_stress, max_defl
+
+    # The closed form gives the same member forces as the PyNite model (the truss is statically
+    # determinate), so frames it already puts far past yield lose selection regardless;
+    # they keep their closed-form results and skip the PyNite solve.
+    # Fitness is mass plus non-negative penalties, and the closed-form mass is exact, so frames
+    # already heavier than the best fitness cannot improve on it and are skipped the same way
+    screened = np.flatnonzero((max_stress <= SCREEN_STRESS_FACTOR * yield_stress) & (mass <= best_fitness))
+    results = exact.analyze(population, screened)
+    if results:
+        mass[screened], max_stress[screened], max_defl[screened] = (np.array(column) for column in zip(*results))
+    return mass, max_stress, max_defl
+
+def optimize_frame(pop_size=20, generations=50, mutation_rate=0.1, use_exact=False, processes=None,
+                   patience=15, tolerance=1e-4, plot_progress=False):
+    """Genetic algorithm to minimize frame mass under stress/deflection constraints.
+
+    The population is held as a (pop_size, 5) array, one row of design variables
+    per frame, so each generation is evaluated, ranked, and bred with whole-array
+    operations. Only the best design is turned back into a Frame.
+
+    use_exact=True evaluates fitness with the PyNite model instead of the closed
+    form, spread over `processes` worker processes (default: one per core).
+
+    The run stops early once the best fitness has not improved by more than
+    `tolerance` (relative) for `patience` generations in a row.
+
+    plot_progress=True redraws the best frame in one live figure whenever it improves.
+    """
+    # The PyNite solves of a generation are independent, so they run in parallel
+    exact = ExactEvaluator(pop_size, processes) if use_exact else None
+    try:
+        return _evolve(pop_size, generations, mutation_rate, exact, patience, tolerance, plot_progress)
+    finally:
+        if exact is not None:
+            exact.close()
+
+def _evolve(pop_size, generations, mutation_rate, exact, patience, tolerance, plot_progress):
+    """GA loop of optimize_frame; fitness is evaluated with evaluate_population(population, exact, best_fitness)."""
 
     # Step 1: Initialize population with random frames
-    population = [Frame.random_frame() for _ in range(pop_size)]
+    population = RNG.uniform(LOWER_BOUNDS, UPPER_BOUNDS, size=(pop_size, 5))
+    new_pop = np.empty_like(population)  # next generation is written here, then the two buffers swap
     best_frame = None
     best_fitness = float('inf')
+    stale_generations = 0  # consecutive generations without a meaningful improvement
+
+    # One figure for the whole run, redrawn in place when the best frame improves
+    # Interactive mode is only needed for the live redraws; the figure is closed and the caller's setting
+    # restored when the run ends
+    was_interactive = plt.isinteractive()
+    if plot_progress:
+        plt.ion()
+        fig, ax = plt.subplots()
+        plt.show(block=False)
 
-    # Evolution loop
-    for gen in range(generations):
-        fitness_scores = []
+    try:
+        # Mutation moves a variable by up to 10% of its range
+        mutation_deltas = 0.1 * (UPPER_BOUNDS - LOWER_BOUNDS)
 
-        # Step 2: Evaluate each frame's performance
-        for frame in population:
-            mass, max_stress, max_defl = analyze_frame(frame)
+        # Evolution loop
+        for gen in range(generations):
+
+            # Step 2: Evaluate each frame's performance
+            mass, max_stress, max_defl = evaluate_population(population, exact, best_fitness)
 
             # Step 3: Compute fitness score (base = mass, add penalties)
-            fitness = mass
+            fitness = mass.copy()
+            # Stress constraint violation penalty
+            fitness += np.where(max_stress > yield_stress, mass * 10 * ((max_stress / yield_stress) - 1), 0.0)
+            # Deflection constraint violation penalty
+            fitness += np.where(max_defl > max_deflection, mass * 10 * ((max_defl / max_deflection) - 1), 0.0)
 
-            if max_stress > yield_stress:
-                # Stress constraint violation penalty
-                fitness += mass * 10 * ((max_stress / yield_stress) - 1)
+            # Step 4: Rank by fitness (lower fitness = better)
+            # Only the top 2 are ranked; parents are chosen by tournament, so the rest is never sorted
+            elite_rows = np.argpartition(fitness, 1)[:2]
+            elite_rows = elite_rows[np.argsort(fitness[elite_rows])]
 
-            if max_defl > max_deflection:
-                # Deflection constraint violation penalty
-                fitness += mass * 10 * ((max_defl / max_deflection) - 1)
+            # Update best frame found so far
+            best = elite_rows[0]
+            if fitness[best] < best_fitness * (1 - tolerance):
+                stale_generations = 0
+            else:
+                stale_generations += 1
+            if fitness[best] < best_fitness:
+                best_fitness = fitness[best]
+                best_frame = Frame(*population[best])
+                print(f"Generation {gen}: Best mass = {mass[best]:.2f} kg, "
+                      f"Max stress = {max_stress[best]:.1f} Pa, Max defl = {max_defl[best]:.3f} m")
+            
+                # Plot the frame
+                if plot_progress:
+                    ax.clear()
+                    nodes = best_frame.nodes
+                    members = best_frame.members
+                    for n1, n2, _ in members:
+                        x_vals = [nodes[n1][0], nodes[n2][0]]
+                        y_vals = [nodes[n1][1], nodes[n2][1]]
+                        ax.plot(x_vals, y_vals, 'bo-', linewidth=2)
+                    ax.set_title(f"Generation {gen}")
+                    ax.set_aspect('equal')
+                    ax.set_xlabel("X (m)")
+                    ax.set_ylabel("Y (m)")
+                    ax.grid(True)
+                    fig.canvas.draw_idle()
+                    fig.canvas.flush_events()
 
-            fitness_scores.append((fitness, frame, mass, max_stress, max_defl))
+            # Stop once the population has converged
+            if stale_generations >= patience:
+                print(f"Generation {gen}: no improvement in {patience} generations, stopping")
+                break
 
-        # Step 4: Rank by fitness
-        fitness_scores.sort(key=lambda x: x[0])  # lower fitness = better
+            # Step 5: Selection (3-way tournaments, one per parent)
+            num_children = pop_size - 2
+            parent1 = population[_tournament(fitness, num_children)]
+            parent2 = population[_tournament(fitness, num_children)]
 
-        # Update best frame found so far
-        best_current = fitness_scores[0]
-        if best_current[0] < best_fitness:
-            best_fitness = best_current[0]
-            best_frame = best_current[1]
-            print(f"Generation {gen}: Best mass = {best_current[2]:.2f} kg, "
-                  f"Max stress = {best_current[3]:.1f} Pa, Max defl = {best_current[4]:.3f} m")
-            
-            # Plot the frame
-            fig, ax = plt.subplots()
-            nodes = best_current[1].nodes
-            members = best_current[1].members
-            for n1, n2, _ in members:
-                x_vals = [nodes[n1][0], nodes[n2][0]]
-                y_vals = [nodes[n1][1], nodes[n2][1]]
-                ax.plot(x_vals, y_vals, 'bo-', linewidth=2)
-            ax.set_title(f"Generation {gen}")
-            ax.set_aspect('equal')
-            ax.set_xlabel("X (m)")
-            ax.set_ylabel("Y (m)")
-            plt.grid(True)
-            plt.show(block=False)
-            plt.pause(0.1)
-            plt.close()
-
-        # Step 5: Selection (top 50% as parents)
-        num_parents = pop_size // 2
-        parents = [fs[1] for fs in fitness_scores[:num_parents]]
-
-        # Step 6: Reproduce new population
-        new_pop = []
-        # Elitism: keep top 2 frames unchanged
-        new_pop.append(fitness_scores[0][1])
-        new_pop.append(fitness_scores[1][1])
-
-        # Generate offspring via crossover and mutation
-        while len(new_pop) < pop_size:
-            parent1 = random.choice(parents)
-            parent2 = random.choice(parents)
+            # Step 6: Reproduce new population
+            # Elitism: keep top 2 frames unchanged
+            new_pop[:2] = population[elite_rows]
 
+            # Generate offspring via crossover and mutation
             # Crossover: randomly inherit each design variable
-            child_width = random.choice([parent1.width, parent2.width])
-            child_height = random.choice([parent1.height, parent2.height])
-            child_area_left = random.choice([parent1.area_left, parent2.area_left])
-            child_area_right = random.choice([parent1.area_right, parent2.area_right])
-            child_area_base = random.choice([parent1.area_base, parent2.area_base])
-
-            child = Frame(child_width, child_height, child_area_left, child_area_right, child_area_base)
-            child.mutate(mutation_rate=0.1)  # Mutate child design
-            new_pop.append(child)
-
-        # Step 7: Update population
-        population = new_pop
+            children = np.where(RNG.random((num_children, 5)) < 0.5, parent1, parent2)
+
+            # Mutation: each variable has a chance (mutation_rate) to be perturbed, then is kept within bounds
+            mutated = RNG.random((num_children, 5)) < mutation_rate
+            perturbations = RNG.uniform(-mutation_deltas, mutation_deltas, size=(num_children, 5))
+            children = np.where(mutated, np.clip(children + perturbations, LOWER_BOUNDS, UPPER_BOUNDS), children)
+            new_pop[2:] = children
+
+            # Step 7: Update population
+            population, new_pop = new_pop, population
+    finally:
+        if plot_progress:
+            plt.close(fig)
+            if not was_interactive:
+                plt.ioff()
 
     return best_frame
 
@@ -1,8 +1,21 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from numba import njit
 
 #all units are SI
 
+
+@njit(cache=True)
+def _mirror_nodes(nodes_left, nodes_right):
+    """
+    Writes the mirror image of each left node (Y coordinate flipped) into the same row of nodes_right.
+    Both arrays are (N, 3); called on every symmetry update, so it is compiled rather than looped in Python.
+    """
+    for i in range(nodes_left.shape[0]):
+        nodes_right[i, 0] = nodes_left[i, 0]
+        nodes_right[i, 1] = -nodes_left[i, 1]
+        nodes_right[i, 2] = nodes_left[i, 2]
+
 class Frame():
     """
     Custom class to hold all information about the frame structure.
@@ -16,25 +29,30 @@ class Frame():
 
         Nodes are divided into reaction nodes, load nodes, intermediate nodes, and symmetry nodes.
         We start by defining the left side, then enforcing symmetry on the entire 
-        Each type except symmetry has both a right and left dictionary. In the "right" dictionary, a string will be appended to the key to
-        differentiate it.
+        The left and right sides each store all of their nodes in one (N, 3) array, grouped by type in the order
+        reaction, load, intermediate, with the node names in a parallel list. In the "right" names, a string will be
+        appended to each name to differentiate it.
         Symmetry nodes are locked to Y=0, but otherwise behave like intermediate nodes
         """
 
-        #reaction nodes
-        self.reaction_nodes_left = {"react1": np.array([0.0, 0.28, 0.0]), "react2": np.array([0.4, 0.28, 0.0])}
-        self.reaction_nodes_right = {}    
-
-        #load nodes
-        self.load_nodes_left = {"Pivot": np.array([-0.1, 0.26, 0.15]), "Actuator": np.array([0.3, 0.26, 0.05])}
-        self.load_nodes_right = {}
-
-        #intermediate nodes
-        self.intermediate_nodes_left = {"I1": np.array([0.0, 0.26, 0.1])}
-        self.intermediate_nodes_right = {}
+        #left side nodes: reaction nodes, then load nodes, then intermediate nodes
+        #intermediate nodes come last so adding or removing them leaves the other types in place
+        self.node_names_left = ["react1", "react2",                            #reaction nodes
+                                "Pivot", "Actuator",                           #load nodes
+                                "I1"]                                          #intermediate nodes
+        self.nodes_left = np.array([[0.0, 0.28, 0.0], [0.4, 0.28, 0.0],
+                                    [-0.1, 0.26, 0.15], [0.3, 0.26, 0.05],
+                                    [0.0, 0.26, 0.1]])
+        self.num_reaction_nodes = 2
+        self.num_load_nodes = 2
+
+        #right side nodes, filled in by _enforce_symmetry
+        self.node_names_right = []
+        self.nodes_right = np.empty((0, 3))
 
         #symmetry nodes
-        self.symmetry_nodes = {"Sym1": np.array([0.0, 0.0, 0.0]), "Sym2": np.array([0.0, 0.0, 0.1])}
+        self.symmetry_node_names = ["Sym1", "Sym2"]
+        self.symmetry_nodes = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.1]])
 
         #members
         self.members = {}
@@ -43,33 +61,34 @@ class Frame():
         self._enforce_symmetry()
 
 
+    @property
+    def reaction_slice(self):
+        """Rows of nodes_left / nodes_right holding the reaction nodes."""
+        return slice(0, self.num_reaction_nodes)
+
+    @property
+    def load_slice(self):
+        """Rows of nodes_left / nodes_right holding the load nodes."""
+        return slice(self.num_reaction_nodes, self.num_reaction_nodes + self.num_load_nodes)
+
+    @property
+    def intermediate_slice(self):
+        """Rows of nodes_left / nodes_right holding the intermediate nodes."""
+        return slice(self.num_reaction_nodes + self.num_load_nodes, len(self.nodes_left))
+
+
     def _enforce_symmetry(self):
         """
-        Deletes all points in the "right" dictionaries and replaces them with mirrored copies of the points in the "left" dictionaries.
+        Replaces all of the "right" nodes with mirrored copies of the "left" nodes.
         Mirrors members, loads, and constraints as well in similar ways.
         Symmetry nodes are not mirrored, but are instead locked to Y=0.
         """
-        self.reaction_nodes_right = {}
-        for node in self.reaction_nodes_left:
-            new_name = node + "R"                                                                       #make name distinct from left version
-            self.reaction_nodes_right[new_name] = self.reaction_nodes_left[node].copy()
-            self.reaction_nodes_right[new_name][1] *= -1                                                #flip Y coordinate
-
-        self.load_nodes_right = {}
-        for node in self.load_nodes_left:
-            new_name = node + "R"                                                                       #make name distinct from left version
-            self.load_nodes_right[new_name] = self.load_nodes_left[node].copy()
-            self.load_nodes_right[new_name][1] *= -1                                                    #flip Y coordinate
-
-        self.intermediate_nodes_right = {}
-        for node in self.intermediate_nodes_left:
-            new_name = node + "R"                                                                       #make name distinct from left version
-            self.intermediate_nodes_right[new_name] = self.intermediate_nodes_left[node].copy()
-            self.intermediate_nodes_right[new_name][1] *= -1                                            #flip Y coordinate
-
+        self.node_names_right = [node + "R" for node in self.node_names_left]                         #make names distinct from left version
+        if self.nodes_right.shape != self.nodes_left.shape:                                             #reuse the right array unless the node count changed
+            self.nodes_right = np.empty_like(self.nodes_left)
+        _mirror_nodes(self.nodes_left, self.nodes_right)                                                #copy with flipped Y coordinate
 
-        for node in self.symmetry_nodes:
-            self.symmetry_nodes[node][1] = 0.0                                                          # Ensure Y coordinate is locked to 0
+        self.symmetry_nodes[:, 1] = 0.0                                                                 # Ensure Y coordinate is locked to 0
 
 
         
@@ -117,25 +136,11 @@ if __name__ == "__main__":
 
     test_frame = Frame()
 
-    print(test_frame.reaction_nodes_right)
+    print(test_frame.nodes_right[test_frame.reaction_slice])
 
     #plotting
-    react_r = test_frame.reaction_nodes_right.copy()
-    react_l = test_frame.reaction_nodes_left.copy()
-    load_r = test_frame.load_nodes_right.copy()
-    load_l = test_frame.load_nodes_left.copy()
-    int_r = test_frame.intermediate_nodes_right.copy()
-    int_l = test_frame.intermediate_nodes_left.copy()
-    sym = test_frame.symmetry_nodes.copy()
-
-    all_nodes = react_r | react_l | load_r | load_l | int_r | int_l | sym
-    xdata = []
-    ydata = []
-    zdata = []
-    for node in all_nodes:                          #rearrange point data into lists for plotting
-        xdata.append(all_nodes[node][0])
-        ydata.append(all_nodes[node][1])
-        zdata.append(all_nodes[node][2])
+    all_nodes = np.concatenate((test_frame.nodes_right, test_frame.nodes_left, test_frame.symmetry_nodes))
+    xdata, ydata, zdata = all_nodes.T
 
     plt.figure()
     ax = plt.axes(projection='3d')
@@ -1,23 +1,39 @@
-import math
+from dataclasses import dataclass
 
-def frameMass(density: float, geometry: list) -> float:
-    mass = 0.0
-    for element in geometry:
-        outerDiameter, thickness, length = element
-        volume = math.pi*length*((outerDiameter**2) - ((outerDiameter - thickness)**2))
-        mass += density*volume
-    return mass
+import numpy as np
+
+
+@dataclass
+class FrameGeometry:
+    # one entry per element, each column stored as its own contiguous array
+    outerDiameter: np.ndarray
+    thickness: np.ndarray
+    length: np.ndarray
+
+    @classmethod
+    def from_rows(cls, geometry) -> "FrameGeometry":
+        # geometry is one row of [outer diameter, thickness, length] per element
+        outerDiameter, thickness, length = np.asarray(geometry, dtype=float).T
+        return cls(np.ascontiguousarray(outerDiameter), np.ascontiguousarray(thickness), np.ascontiguousarray(length))
+
+
+def frameMass(density: float, geometry: FrameGeometry) -> float:
+    # all elements are summed at once; a list of [outer diameter, thickness, length] rows is also accepted
+    if not isinstance(geometry, FrameGeometry):
+        geometry = FrameGeometry.from_rows(geometry)
+    outerDiameter, thickness, length = geometry.outerDiameter, geometry.thickness, geometry.length
+    volume = np.pi*length*((outerDiameter**2) - ((outerDiameter - thickness)**2))
+    return float(density*volume.sum())
 
 
 
 aluminum_6061_density = 2720 #kg/m^3
 
-geometry = [[.04, .002, .3],
-            [.05, .002, .8],
-            [.03, .006, .9],
-            [.02, .002, .3],
-            [.04, .004, .4],]
+geometry = FrameGeometry.from_rows([[.04, .002, .3],
+                                    [.05, .002, .8],
+                                    [.03, .006, .9],
+                                    [.02, .002, .3],
+                                    [.04, .004, .4],])
 
 test_mass = frameMass(aluminum_6061_density, geometry)
 print(f"The mass of the frame is {test_mass} kg")
-
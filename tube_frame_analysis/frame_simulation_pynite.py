@@ -1,6 +1,8 @@
 from Pynite import FEModel3D
 import numpy as np
 import math
+from functools import lru_cache
+from numba import njit, prange
 
 
 
@@ -22,6 +24,23 @@ Directly pull out deflections from the node of interest.
 
 
 """
+def _tube_section_properties(OD, ID):
+
+    # works element-wise, so OD and ID may be scalars or arrays of tube sizes
+    Iy = Iz = math.pi*(1/64)*(OD**4 - ID**4)
+    J = 2*Iy
+    A = math.pi*(1/4)*(OD**2 - ID**2)
+
+    return Iy, Iz, J, A
+
+
+@lru_cache(maxsize=64)
+def _cached_tube_section_properties(OD, ID):
+
+    # a design only has a handful of distinct tube sizes, so each one is computed once and reused for every member
+    return _tube_section_properties(OD, ID)
+
+
 def section_properties(shape, *args):
     
     #returns tuple of section properties in order of Iy, Iz, J, A
@@ -29,11 +48,10 @@ def section_properties(shape, *args):
     if shape == "tube":
         OD = args[0]
         ID = args[1]
-        Iy = Iz = math.pi*(1/64)*(OD**4 - ID**4)
-        J = 2*Iy
-        A = math.pi*(1/4)*(OD**2 - ID**2)
-
-        return Iy, Iz, J, A
+        # only scalar sizes are hashable cache keys; arrays of sizes are computed directly
+        if np.ndim(OD) == 0 and np.ndim(ID) == 0:
+            return _cached_tube_section_properties(float(OD), float(ID))
+        return _tube_section_properties(np.asarray(OD), np.asarray(ID))
     
     if shape == "box":
         width_outer = W = args[0]
@@ -89,31 +107,83 @@ members = []
 # for each test point, find principle stresses
 
 
-def find_stress_on_tube(location, load_list, section_properties, OD, ID):
+def find_stress_on_tube(y_pos, z_pos, forces, moments, section_properties, OD, ID):
     
     # assume circular cross section
-    # "location" is a 3D vector respresenting the point of stress in member-space
-    y_pos = location[1]
-    z_pos = location[2]
+    # y_pos and z_pos are arrays of shape (P,) locating each test point on the cross section in member-space
+    # forces and moments are (P, 3) arrays of the internal forces (Fx, Fy, Fz) and moments (Mx, My, Mz) at each test point
+    # returns a (P, 3) array of axial stress, shear y, and shear z at each test point
+    y_pos = np.asarray(y_pos, dtype=float)
+    z_pos = np.asarray(z_pos, dtype=float)
+    forces = np.asarray(forces, dtype=float)
+    moments = np.asarray(moments, dtype=float)
 
     Iy = Iz = section_properties[0]
     J = section_properties[2]
     A = section_properties[3]
 
-    Fx, Fy, Fz = load_list[0], load_list[1], load_list[2]           #internal forces at the point of interest
-    Mx, My, Mz = load_list[3], load_list[4], load_list[5]           #internal moments at the point of interest
+    Fx, Fy, Fz = forces[:, 0], forces[:, 1], forces[:, 2]           #internal forces at the points of interest
+    Mx, My, Mz = moments[:, 0], moments[:, 1], moments[:, 2]        #internal moments at the points of interest
     
     Qz, bz = shear_constants("tube", z_pos, OD, ID)
     Qy, by = shear_constants("tube", y_pos, OD, ID)
 
+    stresses = np.empty((len(y_pos), 3))
 
-    axial_stress = (Fx/A) + (My*z_pos/Iy) - (Mz*y_pos/Iz)
-    shear_stress_z = (Fz*Qz)/(Iz*bz)
-
-    
-    
     #axial stress
+    stresses[:, 0] = (Fx/A) + (My*z_pos/Iy) - (Mz*y_pos/Iz)
     #shear y
+    stresses[:, 1] = (Fy*Qy)/(Iy*by)
     #shear z 
+    stresses[:, 2] = (Fz*Qz)/(Iz*bz)
+
+    return stresses
+
+
+def max_von_mises_stress(y_pos, z_pos, forces, moments, section_properties, OD, ID):
+
+    # same inputs as find_stress_on_tube, reduced straight to the max von mises stress over all test points
+    y_pos = np.ascontiguousarray(y_pos, dtype=float)
+    z_pos = np.ascontiguousarray(z_pos, dtype=float)
+    forces = np.ascontiguousarray(forces, dtype=float)
+    moments = np.ascontiguousarray(moments, dtype=float)
+
+    Iy = Iz = section_properties[0]
+    A = section_properties[3]
+
+    # shear_constants may return scalars (constant over the section) or per-point arrays; the kernel takes (P,) arrays
+    Qz, bz = (np.broadcast_to(np.asarray(c, dtype=float), y_pos.shape) for c in shear_constants("tube", z_pos, OD, ID))
+    Qy, by = (np.broadcast_to(np.asarray(c, dtype=float), y_pos.shape) for c in shear_constants("tube", y_pos, OD, ID))
+
+    return _max_von_mises_stress(y_pos, z_pos, forces, moments, Iy, Iz, A, Qy, by, Qz, bz)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _max_von_mises_stress(y_pos, z_pos, forces, moments, Iy, Iz, A, Qy, by, Qz, bz):
+
+    # compiled kernel behind max_von_mises_stress; Qy, by, Qz, bz are (P,) arrays matching the test points
+    # scalars are kept inside the loop so no (P,) temporaries are built per stress component
+    max_stress = 0.0
+    for k in prange(y_pos.shape[0]):
+        axial_stress = (forces[k, 0]/A) + (moments[k, 1]*z_pos[k]/Iy) - (moments[k, 2]*y_pos[k]/Iz)
+        shear_stress_y = (forces[k, 1]*Qy[k])/(Iy*by[k])
+        shear_stress_z = (forces[k, 2]*Qz[k])/(Iz*bz[k])
+        von_mises_stress = math.sqrt(axial_stress*axial_stress + 3*(shear_stress_y*shear_stress_y + shear_stress_z*shear_stress_z))
+        max_stress = max(max_stress, von_mises_stress)
+
+    return max_stress
+
+
+def tube_test_points(OD, length, n_along=20, n_around=16):
+
+    # evenly spaced test points on the outer surface of a tube member, in member-space
+    # returns flattened arrays (x, y, z) of shape (n_along*n_around,), one entry per test point
+    x = np.linspace(0, length, n_along)
+    theta = np.linspace(0, 2*math.pi, n_around, endpoint=False)
+    x_grid, theta_grid = np.meshgrid(x, theta, indexing="ij")
+    y_grid = (OD/2)*np.cos(theta_grid)
+    z_grid = (OD/2)*np.sin(theta_grid)
+
+    return x_grid.ravel(), y_grid.ravel(), z_grid.ravel()
 
 #find max deformation of load application points, max global deformation, and max global stress
\ No newline at end of file